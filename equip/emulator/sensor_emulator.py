@@ -1,37 +1,51 @@
 #!/usr/bin/env python3
 """
 sensor_emulator.py
-Given simdata.json (columns: time, V(node), I(V1) ...),
+Given simdata.npz (columns: time, V(node), I(V1) ...),
 produce sensor ADC outputs for:
 - ZMPT101B => GPIO34 (0-3.3V approximate)
 - ACS712 => GPIO35 (centered ~2.5V)
 - NTC => GPIO32 (voltage divider)
 - Piezo envelope => GPIO33
 - Relay drive sense => GPIO26 (digital drive)
-Outputs unified sensors.json
+Outputs unified sensors.npz (or sensors.json)
 """
-import json
+import orjson
 import numpy as np
+from numba import njit
 from pathlib import Path
 
-def load_simjson(path="simdata.json"):
-    return json.load(open(path))
+# shared noise generator for all emulators; call seed() for reproducible output
+_rng = np.random.default_rng()
+
+def seed(s=None):
+    global _rng
+    _rng = np.random.default_rng(s)
+
+# emulate_* return contiguous float32 arrays; orjson serializes them without a .tolist() copy
+
+def load_simjson(path="simdata.npz"):
+    # .npz column arrays from run_ngspice, or a JSON column dump
+    if Path(path).suffix == ".npz":
+        with np.load(path) as z:
+            return {k: z[k] for k in z.files}
+    return orjson.loads(Path(path).read_bytes())
 
 def emulate_zmpt(simdata, voltage_node_key, vcc=3.3):
     # simdata has V(node) for mains (peak value). We'll convert instantaneous voltage -> sensor ADC reading 0..3.3
     # Map: Vpeak ~ 325V -> sensor amplitude -> 0.006 * Vin + offset (example)
     v = np.array(simdata.get(voltage_node_key))
     # v likely is instantaneous voltage; scale factor chosen for module mapping in earlier scripts
-    out = 1.5 + 0.006 * v + 0.01 * np.random.randn(len(v))
-    return out.tolist()
+    out = 1.5 + 0.006 * v + 0.01 * _rng.standard_normal(len(v))
+    return np.ascontiguousarray(out, dtype=np.float32)
 
 def emulate_acs(simdata, current_key, vcc=3.3, sensitivity=0.066):
     # ACS712 outputs Vcc/2 + sensitivity * I (A)
     # If current_key holds I(V1) (current through source), we map that current to ACS reading
     i = np.array(simdata.get(current_key))
     # i may be source current; ensure correct sign
-    out = (vcc/2.0) + sensitivity * i + 0.01 * np.random.randn(len(i))
-    return out.tolist()
+    out = (vcc/2.0) + sensitivity * i + 0.01 * _rng.standard_normal(len(i))
+    return np.ascontiguousarray(out, dtype=np.float32)
 
 def emulate_ntc(simdata, temp_node_key):
     # If SPICE did not simulate thermal model, we use node voltage as proxy for temperature node
@@ -47,28 +61,37 @@ def emulate_ntc(simdata, temp_node_key):
         temps = 25.0 + (arr - arr.mean())*5.0
     # convert temperature to divider voltage: assume Vout = 1.65 + (T - 25)*0.01
     volt = 1.65 + (temps - 25.0) * 0.01
-    return volt.tolist()
+    return np.ascontiguousarray(volt, dtype=np.float32)
+
+@njit(cache=True, fastmath=True)
+def _iir_lp(env, alpha):
+    # first-order IIR lowpass (RC envelope smoothing), compiled so the recurrence runs as a tight loop
+    out = np.empty_like(env)
+    s = 0.0
+    for i in range(env.size):
+        s = alpha * env[i] + (1 - alpha) * s
+        out[i] = s
+    return out
 
 def emulate_piezo(simdata, piezo_key):
     arr = np.array(simdata.get(piezo_key)) if piezo_key in simdata else np.zeros_like(np.array(simdata['time']))
     # envelope detector simulation: absolute + RC smoothing
-    env = np.abs(arr)
+    env = np.abs(arr).astype(np.float64)
     # simple lowpass smoothing
     alpha = 0.05
-    out = []
-    s = 0.0
-    for x in env:
-        s = alpha * x + (1 - alpha) * s
-        out.append(s + 0.005*np.random.randn())
-    return out
+    # draw all sensor noise in one call instead of once per sample
+    noise = 0.005 * _rng.standard_normal(env.size, dtype=np.float32)
+    out = _iir_lp(env, alpha)
+    out += noise
+    return np.ascontiguousarray(out, dtype=np.float32)
 
 def emulate_relay(simdata, relay_key):
     # If relay drive is present, it may be 0/1 waveform
     arr = np.array(simdata.get(relay_key)) if relay_key in simdata else np.zeros_like(np.array(simdata['time']))
-    return arr.tolist()
+    return np.ascontiguousarray(arr, dtype=np.float32)
 
-def run_emulator(simjson="simdata.json", mapping=None, out="sensors.json"):
-    simdata = load_simjson(simjson)
+def run_emulator_from_dict(simdata, mapping=None):
+    # in-process entry: simdata column dict -> dict of sensor arrays, no file I/O
     # mapping keys
     if mapping is None:
         mapping = {
@@ -90,14 +113,24 @@ def run_emulator(simjson="simdata.json", mapping=None, out="sensors.json"):
         outdict["GPIO33"] = emulate_piezo(simdata, mapping["piezo_key"])
     if mapping.get("relay_key") in simdata:
         outdict["GPIO26"] = emulate_relay(simdata, mapping["relay_key"])
-    Path(out).write_text(json.dumps(outdict, indent=2))
+    return outdict
+
+def run_emulator(simjson="simdata.npz", mapping=None, out="sensors.npz"):
+    simdata = load_simjson(simjson)
+    outdict = run_emulator_from_dict(simdata, mapping)
+    if Path(out).suffix == ".npz":
+        np.savez(out, **outdict)
+    else:
+        Path(out).write_bytes(orjson.dumps(outdict, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
     print(f"Wrote sensor outputs to {out}")
     return out
 
 if __name__ == "__main__":
     import argparse
     p = argparse.ArgumentParser()
-    p.add_argument("--sim", "-s", default="../spice_runner/simdata.json")
-    p.add_argument("--out", "-o", default="sensors.json")
+    p.add_argument("--sim", "-s", default="../spice_runner/simdata.npz")
+    p.add_argument("--out", "-o", default="sensors.npz")
+    p.add_argument("--seed", type=int, default=None)
     args = p.parse_args()
+    seed(args.seed)
     run_emulator(args.sim, out=args.out)
@@ -1,25 +1,29 @@
 #!/usr/bin/env python3
-import json
 from pathlib import Path
 import numpy as np
+import pandas as pd
+import orjson
 
-def unify(sensors_path="sensors.json", out="unified_log.json"):
-    d = json.load(open(sensors_path))
+def unify_from_dict(d):
+    # in-process entry: dict of sensor arrays -> per-timestamp DataFrame
     # ensure sample rate and aligned arrays
     t = np.array(d['time'])
-    keys = [k for k in d.keys() if k!="time"]
-    # build per-timestamp objects
-    rows = []
-    for i in range(len(t)):
-        row = {"time": float(t[i])}
-        for k in keys:
-            arr = d[k]
-            if i < len(arr):
-                row[k] = float(arr[i])
-            else:
-                row[k] = None
-        rows.append(row)
-    Path(out).write_text(json.dumps(rows, indent=2))
+    # build per-timestamp objects: pandas pads shorter channels with NaN (written as null)
+    df = pd.DataFrame({k: pd.Series(v, dtype=float) for k, v in d.items()})
+    return df.iloc[:len(t)]
+
+def unify(sensors_path="sensors.npz", out="unified_log.parquet"):
+    if Path(sensors_path).suffix == ".npz":
+        with np.load(sensors_path) as z:
+            d = {k: z[k] for k in z.files}
+    else:
+        d = orjson.loads(Path(sensors_path).read_bytes())
+    df = unify_from_dict(d)
+    if Path(out).suffix == ".parquet":
+        df.to_parquet(out, index=False)
+    else:
+        rows = df.to_dict(orient='records')
+        Path(out).write_bytes(orjson.dumps(rows, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
     print("Wrote", out)
     return out
 
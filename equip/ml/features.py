@@ -1,28 +1,117 @@
 # features.py
 import numpy as np
 import pandas as pd
-from scipy import stats
+from numba import njit, prange
+from numpy.lib.stride_tricks import sliding_window_view
+
+# column order of the stats returned by extract_basic_stats / windowed_features
+STAT_NAMES = ("mean", "std", "max", "min", "rms", "skew", "kurt")
 
 def windowed_features(series, window_size=100, step=50):
-    # simple sliding windows -> produce list of feature dicts
-    X = []
-    for start in range(0, len(series)-window_size+1, step):
-        w = series[start:start+window_size]
-        X.append(extract_basic_stats(w))
-    return X
+    # sliding windows -> (n_windows, len(STAT_NAMES)) float32 array, all windows reduced at once
+    series = np.asarray(series, dtype=np.float64)
+    if len(series) < window_size:
+        return np.empty((0, len(STAT_NAMES)), dtype=np.float32)
+    W = sliding_window_view(series, window_size)[::step]
+    return batch_basic_stats(W).astype(np.float32)
+
+def batch_basic_stats(M):
+    # row-wise extract_basic_stats for a 2-D (n_rows, n_samples) array -> (n_rows, len(STAT_NAMES))
+    return _batch_moments(np.asarray(M, dtype=np.float64))
+
+# fastmath without the no-nan/no-inf assumptions, so nan inputs and results survive
+_FASTMATH = {"reassoc", "contract", "nsz", "arcp"}
+
+@njit(cache=True, fastmath=_FASTMATH)
+def _moments(a):
+    # single pass over the window: power sums (shifted by a[0] for stability) plus min/max
+    n = a.size
+    if n == 0:
+        raise ValueError("cannot compute stats of an empty array")
+    c = a[0]
+    s1 = 0.0
+    s2 = 0.0
+    s3 = 0.0
+    s4 = 0.0
+    sq = 0.0
+    mn = a[0]
+    mx = a[0]
+    has_nan = False
+    for i in range(n):
+        x = a[i]
+        d = x - c
+        d2 = d * d
+        s1 += d
+        s2 += d2
+        s3 += d2 * d
+        s4 += d2 * d2
+        sq += x * x
+        if x != x:
+            has_nan = True
+        if x < mn:
+            mn = x
+        if x > mx:
+            mx = x
+    # central moments from the raw (shifted) ones
+    e1 = s1 / n
+    m2 = s2 / n - e1**2
+    m3 = s3 / n - 3 * e1 * s2 / n + 2 * e1**3
+    m4 = s4 / n - 4 * e1 * s3 / n + 6 * e1**2 * s2 / n - 3 * e1**4
+    if m2 < 0.0:
+        m2 = 0.0
+    if m2 > 0.0:
+        skew = m3 / m2**1.5
+        kurt = m4 / m2**2 - 3.0
+    else:
+        # constant window: match scipy.stats, which yields nan here
+        skew = np.nan
+        kurt = np.nan
+    if has_nan:
+        # comparisons skip nan, so propagate it explicitly like np.max/np.min do
+        mx = np.nan
+        mn = np.nan
+    return c + e1, np.sqrt(m2), mx, mn, np.sqrt(sq / n), skew, kurt
+
+@njit(parallel=True, cache=True, fastmath=_FASTMATH)
+def _batch_moments(M):
+    # rows are independent, so spread them across cores
+    out = np.empty((M.shape[0], 7))
+    for i in prange(M.shape[0]):
+        mean, std, mx, mn, rms, skew, kurt = _moments(M[i])
+        out[i, 0] = mean
+        out[i, 1] = std
+        out[i, 2] = mx
+        out[i, 3] = mn
+        out[i, 4] = rms
+        out[i, 5] = skew
+        out[i, 6] = kurt
+    return out
 
 def extract_basic_stats(arr):
-    arr = np.array(arr)
+    arr = np.asarray(arr, dtype=np.float64)
+    mean, std, mx, mn, rms, skew, kurt = _moments(arr)
     return {
-        "mean": float(np.mean(arr)),
-        "std": float(np.std(arr)),
-        "max": float(np.max(arr)),
-        "min": float(np.min(arr)),
-        "rms": float(np.sqrt(np.mean(arr**2))),
-        "skew": float(stats.skew(arr)),
-        "kurt": float(stats.kurtosis(arr))
+        "mean": float(mean),
+        "std": float(std),
+        "max": float(mx),
+        "min": float(mn),
+        "rms": float(rms),
+        "skew": float(skew),
+        "kurt": float(kurt)
     }
 
+def clean_signals(raw, keys):
+    # float copies of the non-empty signals in keys, with nan/inf replaced by 0
+    signals = {}
+    for k in keys:
+        arr = np.array(raw[k], dtype=float) if k in raw else None
+        if arr is not None and len(arr) > 0:
+            np.nan_to_num(arr, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+            signals[k] = arr
+        else:
+            print(f"Warning: {k} missing or empty, skipping...")
+    return signals
+
 def signals_to_feature_vector(signals):
     # signals: dictionary of arrays for GPIO34..GPIO35...
     features = {}
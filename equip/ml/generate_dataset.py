@@ -1,64 +1,72 @@
 # generate_dataset.py
 import numpy as np
 import pandas as pd
-from features import signals_to_feature_vector
+from features import STAT_NAMES, batch_basic_stats
 import os, json
-from tqdm import trange
+from functools import lru_cache
 
-# simplified emulate functions (similar to backend/emulator version)
-def emulate_zmpt(duration=0.1, fs=1000):
-    t = np.linspace(0, duration, int(duration*fs))
-    sig = (230.0/np.sqrt(2.0)) * np.sin(2*np.pi*50*t)
-    return sig + 0.01*np.random.randn(len(t))
+_rng = np.random.default_rng()
 
-def emulate_acs(fault=False, duration=0.1, fs=1000):
-    t = np.linspace(0, duration, int(duration*fs))
-    base = 0.2 * np.sin(2*np.pi*50*t)
-    if fault:
-        # drift
-        base = base + 0.5
-    spikes = np.zeros_like(t)
-    spikes[(t>0.03)&(t<0.031)] = 5.0
-    return base + spikes + 0.02*np.random.randn(len(t))
+# signal columns in the order they appear in the dataset
+SIGNALS = ("GPIO34", "GPIO35", "GPIO33")
 
-def emulate_piezo(spike=False, duration=0.1, fs=1000):
+@lru_cache(maxsize=16)
+def _grid(duration, fs):
+    # time grid, 50 Hz sine and fault-spike masks shared by every emulator call with the
+    # same (duration, fs); read-only since the cached arrays are handed out repeatedly
     t = np.linspace(0, duration, int(duration*fs))
-    s = 0.02*np.random.randn(len(t))
-    if spike:
-        s[(t>0.06)&(t<0.0605)] += 1.5
+    sin50 = np.sin(2*np.pi*50*t)
+    acs_spike_mask = (t>0.03)&(t<0.031)
+    piezo_spike_mask = (t>0.06)&(t<0.0605)
+    for a in (t, sin50, acs_spike_mask, piezo_spike_mask):
+        a.setflags(write=False)
+    return t, sin50, acs_spike_mask, piezo_spike_mask
+
+# simplified emulate functions (similar to backend/emulator version)
+# each returns an (n, duration*fs) batch, one sample per row
+def emulate_zmpt(duration=0.1, fs=1000, n=1):
+    t, sin50, _, _ = _grid(duration, fs)
+    sig = (230.0/np.sqrt(2.0)) * sin50
+    return sig + 0.01*_rng.standard_normal((n, len(t)))
+
+def emulate_acs(fault=False, duration=0.1, fs=1000, n=1):
+    # fault: bool for the whole batch or a per-row boolean mask
+    t, sin50, acs_spike_mask, _ = _grid(duration, fs)
+    out = 0.2 * sin50 + 0.02*_rng.standard_normal((n, len(t)))
+    out[:, acs_spike_mask] += 5.0
+    # drift
+    out[np.broadcast_to(fault, (n,))] += 0.5
+    return out
+
+def emulate_piezo(spike=False, duration=0.1, fs=1000, n=1):
+    # spike: bool for the whole batch or a per-row boolean mask
+    t, _, _, piezo_spike_mask = _grid(duration, fs)
+    s = 0.02*_rng.standard_normal((n, len(t)))
+    s[np.ix_(np.broadcast_to(spike, (n,)), piezo_spike_mask)] += 1.5
     return s
 
-def make_sample(fault=None):
-    v = emulate_zmpt()
-    if fault == "acs":
-        i = emulate_acs(fault=True)
-        p = emulate_piezo(spike=False)
-        label = 1
-    elif fault == "piezo":
-        i = emulate_acs(fault=False)
-        p = emulate_piezo(spike=True)
-        label = 2
-    else:
-        i = emulate_acs(fault=False)
-        p = emulate_piezo(spike=False)
-        label = 0
-    signals = {"GPIO34": v, "GPIO35": i, "GPIO33": p}
-    feats = signals_to_feature_vector(signals)
-    feats['label'] = label
-    return feats
+def make_batch(labels):
+    # labels: 0 = normal, 1 = acs drift fault, 2 = piezo spike fault
+    labels = np.asarray(labels)
+    n = labels.size
+    v = emulate_zmpt(n=n)
+    i = emulate_acs(fault=labels == 1, n=n)
+    p = emulate_piezo(spike=labels == 2, n=n)
+    # one kernel call over every (sample, signal) row; reshaping back keeps the
+    # per-sample columns grouped by signal, in SIGNALS order
+    feats = batch_basic_stats(np.stack([v, i, p], axis=1).reshape(n * len(SIGNALS), -1))
+    feats = feats.reshape(n, len(SIGNALS) * len(STAT_NAMES))
+    columns = [f"{name}_{k}" for name in SIGNALS for k in STAT_NAMES]
+    df = pd.DataFrame(feats, columns=columns)
+    df['label'] = labels.astype(np.int8)
+    return df
 
-def generate_csv(out="ml_data.csv", n_norm=500, n_acs=200, n_piezo=200):
-    rows = []
-    for _ in trange(n_norm):
-        rows.append(make_sample(None))
-    for _ in trange(n_acs):
-        rows.append(make_sample("acs"))
-    for _ in trange(n_piezo):
-        rows.append(make_sample("piezo"))
-    df = pd.DataFrame(rows)
+def generate_parquet(out="ml_data.parquet", n_norm=500, n_acs=200, n_piezo=200):
+    labels = np.repeat([0, 1, 2], [n_norm, n_acs, n_piezo])
+    df = make_batch(labels)
     os.makedirs("ml_data", exist_ok=True)
-    df.to_csv(os.path.join("ml_data", out), index=False)
+    df.to_parquet(os.path.join("ml_data", out), index=False, compression='zstd')
     print("Saved", os.path.join("ml_data", out))
 
 if __name__ == "__main__":
-    generate_csv()
+    generate_parquet()
@@ -1,14 +1,16 @@
-import json
+import math
 import numpy as np
+import orjson
 import requests
-from features import signals_to_feature_vector
+from pathlib import Path
+from features import clean_signals, signals_to_feature_vector
 
-# load processed sensor JSON
-with open(r"D:\INSTINCT4.0\sensors.json") as f:
-    u = json.load(f)
+# keep-alive HTTP session, reused for every request to the prediction server
+_session = requests.Session()
+_session.headers['Content-Type'] = 'application/json'
 
-# check available keys
-print("Available keys:", list(u.keys()))
+# processed sensor data: .npz from sensor_emulator, or JSON (e.g. written by test.py)
+sensors_path = r"D:\INSTINCT4.0\sensors.json"
 
 # pick signals for ML
 signal_map = {
@@ -17,39 +19,32 @@ signal_map = {
     'GPIO33': 'GPIO33'   # Relay / output node
 }
 
-spice_signals = {}
-for k, alias in signal_map.items():
-    if k in u and len(u[k]) > 0:
-        arr = np.array(u[k], dtype=float)
-        # replace nan or inf with 0
-        arr = np.nan_to_num(arr, nan=0.0, posinf=0.0, neginf=0.0)
-        spice_signals[alias] = arr
-    else:
-        print(f"Warning: {k} missing or empty, skipping...")
+# load the mapped signals, reading each member once
+if Path(sensors_path).suffix == ".npz":
+    with np.load(sensors_path) as u:
+        print("Available keys:", u.files)
+        raw = {k: u[k] for k in signal_map if k in u.files}
+else:
+    u = orjson.loads(Path(sensors_path).read_bytes())
+    print("Available keys:", list(u.keys()))
+    raw = {k: u[k] for k in signal_map if k in u}
+
+# replace nan or inf with 0, skipping missing or empty signals
+spice_signals = {signal_map[k]: arr for k, arr in clean_signals(raw, signal_map).items()}
 
 if not spice_signals:
-    raise RuntimeError("No valid signal arrays found in sensors.json")
+    raise RuntimeError(f"No valid signal arrays found in {sensors_path}")
 
 # compute features
 feats = signals_to_feature_vector(spice_signals)
 
-# sanitize features for JSON
-def sanitize_json(d):
-    for k, v in d.items():
-        if isinstance(v, float):
-            if np.isnan(v) or np.isinf(v):
-                d[k] = 0.0
-        elif isinstance(v, dict):
-            sanitize_json(v)
-        elif isinstance(v, list):
-            d[k] = [0.0 if (isinstance(x, float) and (np.isnan(x) or np.isinf(x))) else x for x in v]
-    return d
-
-feats = sanitize_json(feats)
+# sanitize features for JSON: feats is a flat {name: float} dict; non-finite values
+# go out as null, which serve_model treats as missing (nan), as in training
+feats = {k: (v if math.isfinite(v) else None) for k, v in feats.items()}
 
 # send to prediction server (use 127.0.0.1)
 try:
-    resp = requests.post("http://127.0.0.1:9000/predict", json={"features": feats})
+    resp = _session.post("http://127.0.0.1:9000/predict", data=orjson.dumps({"features": feats}))
     resp.raise_for_status()
     print("Predictions:", resp.json())
 except requests.RequestException as e:
@@ -3,27 +3,50 @@ from fastapi import FastAPI
 from pydantic import BaseModel
 import joblib
 import numpy as np
+import xgboost as xgb
 import uvicorn
 import json
+import os
 
 class Payload(BaseModel):
     features: dict
 
+class Prediction(BaseModel):
+    pred: int
+    confidence: float
+
 app = FastAPI()
-model = joblib.load("ml_models/xgb_model.joblib")
+# native booster saved by train_xgb; older runs only left the sklearn wrapper behind
+# value used for absent/null features: the native booster was trained with
+# DMatrix(missing=np.nan), the legacy joblib model on fillna(0) data
+if os.path.exists("ml_models/xgb_model.json"):
+    booster = xgb.Booster()
+    booster.load_model("ml_models/xgb_model.json")
+    MISSING = np.nan
+else:
+    booster = joblib.load("ml_models/xgb_model.joblib").get_booster()
+    MISSING = 0.0
+
+# ensure deterministic order of features: use the booster's feature names if available
+KEYS = tuple(booster.feature_names) if booster.feature_names else None
 
+# absent or null features are filled with MISSING, matching how the loaded model was trained
 @app.post("/predict")
-def predict(payload: Payload):
+def predict(payload: Payload) -> Prediction:
     feat = payload.features
-    # ensure deterministic order of features: use model.feature_names_in_ if available
-    if hasattr(model, 'feature_names_in_'):
-        keys = list(model.feature_names_in_)
+    if KEYS is not None:
+        # fresh float32 row per call; requests run concurrently in the threadpool
+        X = np.empty((1, len(KEYS)), dtype=np.float32)
+        for j, k in enumerate(KEYS):
+            v = feat.get(k)
+            X[0, j] = MISSING if v is None else v
     else:
         keys = sorted(feat.keys())
-    X = np.array([feat.get(k,0) for k in keys]).reshape(1,-1)
-    pred = int(model.predict(X)[0])
-    proba = float(model.predict_proba(X).max())
-    return {"pred": pred, "confidence": proba}
+        X = np.array([feat[k] if feat[k] is not None else MISSING for k in keys], dtype=np.float32).reshape(1,-1)
+    # one pass over the trees gives class probabilities; the label is their argmax
+    proba = booster.inplace_predict(X)
+    # declared return type lets FastAPI serialize straight to JSON bytes via pydantic
+    return Prediction(pred=int(proba.argmax(1)[0]), confidence=float(proba.max()))
 
 if __name__ == "__main__":
     uvicorn.run(app, host="127.0.0.1", port=9000)
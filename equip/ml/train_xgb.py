@@ -1,24 +1,46 @@
 # train_xgb.py
+import numpy as np
 import pandas as pd
 import xgboost as xgb
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, accuracy_score
-import joblib, os
+import os
 
-def train(csv_path="ml_data/ml_data.csv", out_model="ml_models/xgb_model.joblib"):
-    df = pd.read_csv(csv_path)
+def train(data_path="ml_data/ml_data.parquet", out_model="ml_models/xgb_model.json", gpu=False):
+    # parquet from generate_dataset; older datasets may still be CSV
+    if data_path.endswith(".parquet"):
+        df = pd.read_parquet(data_path)
+    else:
+        df = pd.read_csv(data_path)
     if 'label' not in df.columns:
         raise RuntimeError("No label column found")
-    X = df.drop(columns=['label']).fillna(0)
-    y = df['label']
+    # float32 is what XGBoost bins internally; NaNs are left for DMatrix to treat as missing
+    features = df.drop(columns=['label'])
+    feature_names = list(features.columns)
+    X = features.to_numpy(dtype=np.float32)
+    y = df['label'].to_numpy(np.int32)
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
-    clf = xgb.XGBClassifier(n_estimators=200, max_depth=6, use_label_encoder=False, eval_metric='mlogloss')
-    clf.fit(X_train, y_train)
-    preds = clf.predict(X_test)
+    dtrain = xgb.DMatrix(X_train, label=y_train, missing=np.nan, feature_names=feature_names)
+    dtest = xgb.DMatrix(X_test, label=y_test, missing=np.nan, feature_names=feature_names)
+    # histogram splits (on the GPU if requested); num_boost_round is an upper bound, early stopping picks the count
+    params = {
+        'objective': 'multi:softprob',
+        'num_class': int(y.max()) + 1,
+        'max_depth': 6,
+        'tree_method': 'hist',
+        'device': 'cuda' if gpu else 'cpu',
+        'eval_metric': 'mlogloss',
+    }
+    booster = xgb.train(params, dtrain, num_boost_round=500, evals=[(dtest, 'test')],
+                        early_stopping_rounds=20, verbose_eval=False)
+    # keep only the trees up to the best round
+    booster = booster[:booster.best_iteration + 1]
+    preds = booster.predict(dtest).argmax(1)
     print("Accuracy:", accuracy_score(y_test, preds))
     print(classification_report(y_test, preds))
     os.makedirs(os.path.dirname(out_model), exist_ok=True)
-    joblib.dump(clf, out_model)
+    # native booster for serving with inplace_predict
+    booster.save_model(out_model)
     print("Saved model to", out_model)
 
 if __name__ == "__main__":
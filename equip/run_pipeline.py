@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+run_pipeline.py
+In-process version of run_full_pipeline.sh steps 2-4 plus feature extraction:
+ngspice -> parse -> emulate -> unify -> features, handing arrays from stage to
+stage instead of writing and re-reading files. Only ngspice's own output text
+and the unified log are written.
+"""
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+for sub in ("spice_runner", "emulator", "ingest", "ml"):
+    sys.path.insert(0, str(HERE / sub))
+
+from run_ngspice import run_ngspice, read_printed_table
+from sensor_emulator import run_emulator_from_dict
+from unify_logger import unify_from_dict
+from features import clean_signals, signals_to_feature_vector
+
+# sensor channels fed to the model, as in ml/predict.py
+ML_SIGNALS = ("GPIO34", "GPIO35", "GPIO33")
+
+def run_pipeline(netlist="circuit.sp", mapping=None, out="unified_log.parquet"):
+    simdata = read_printed_table(run_ngspice(netlist))
+    sensors = run_emulator_from_dict(simdata, mapping)
+    df = unify_from_dict(sensors)
+    df.to_parquet(out, index=False)
+    print("Wrote", out)
+    # same signal cleanup as ml/predict.py, so both paths yield the same features
+    signals = clean_signals(sensors, ML_SIGNALS)
+    if not signals:
+        raise RuntimeError(f"None of {ML_SIGNALS} were emulated; check the emulator mapping "
+                           f"against the ngspice columns {list(simdata)}")
+    feats = signals_to_feature_vector(signals)
+    return df, feats
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser()
+    p.add_argument("--net", "-n", default="circuit.sp")
+    p.add_argument("--out", "-o", default="unified_log.parquet")
+    args = p.parse_args()
+    _, feats = run_pipeline(args.net, out=args.out)
+    print("Features:", feats)
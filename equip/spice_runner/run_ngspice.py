@@ -1,14 +1,14 @@
 #!/usr/bin/env python3
 """
 run_ngspice.py
-Runs ngspice in batch mode on a netlist and parses printed transient table into CSV/JSON.
+Runs ngspice in batch mode on a netlist and parses printed transient table into CSV/NPZ.
 """
 import subprocess
 import sys
 from pathlib import Path
 import re
-import csv
-import json
+from io import StringIO
+import numpy as np
 
 def run_ngspice(netlist_path: str, out_txt="ngspice_out.txt"):
     # run ngspice -b netlist
@@ -23,13 +23,14 @@ def run_ngspice(netlist_path: str, out_txt="ngspice_out.txt"):
     print("ngspice finished, output saved to", out_txt)
     return out_txt
 
-def parse_printed_table(out_txt):
+def read_printed_table(out_txt):
     """
     Parse ngspice output text for the printed transient table lines.
     ngspice prints lines like:
     Index     time      V(n_ac)     I(V1)
     0   0.000000e+00  ...
     We'll detect the first "Index" header and read subsequent columns.
+    Returns {header: column array}.
     """
     txt = Path(out_txt).read_text()
     lines = txt.splitlines()
@@ -43,30 +44,38 @@ def parse_printed_table(out_txt):
         raise RuntimeError("Could not find transient printed table in ngspice output")
     header_line = lines[header_idx]
     headers = re.split(r'\s+', header_line.strip())
+    # table runs until the next blank line or repeated header; rows with fewer
+    # columns than the header (dashed separators, truncated lines) are skipped
     data_lines = []
     for line in lines[header_idx+1:]:
-        if not line.strip(): break
-        if line.strip().startswith("Index"): break
-        parts = re.split(r'\s+', line.strip())
-        if len(parts) < len(headers): continue
-        data_lines.append(parts[:len(headers)])
+        line = line.strip()
+        if not line or line.startswith("Index"): break
+        if len(line.split()) < len(headers): continue
+        data_lines.append(line)
+    # hand the whole block to the C parser; ngspice may print Fortran-style D exponents
+    table_text = "\n".join(data_lines).replace("D", "E")
+    if data_lines:
+        arr = np.loadtxt(StringIO(table_text), usecols=range(len(headers)), ndmin=2)
+    else:
+        arr = np.empty((0, len(headers)))
+    return {h: arr[:, j] for j, h in enumerate(headers)}
+
+def parse_printed_table(out_txt):
+    """
+    Parse the printed transient table (see read_printed_table) and write it
+    out as simdata.csv and simdata.npz.
+    """
+    col_data = read_printed_table(out_txt)
     # write CSV
     csv_path = "simdata.csv"
-    with open(csv_path,"w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-        writer.writerows(data_lines)
+    np.savetxt(csv_path, np.column_stack(list(col_data.values())), fmt="%.10g", delimiter=",",
+               header=",".join(col_data), comments="")
     print("Wrote", csv_path)
-    # also convert to JSON arrays
-    col_data = {h: [] for h in headers}
-    for row in data_lines:
-        for h, v in zip(headers, row):
-            col_data[h].append(float(v.replace("D", "E")))
-    json_path = "simdata.json"
-    with open(json_path, "w") as f:
-        json.dump(col_data, f, indent=2)
-    print("Wrote", json_path)
-    return json_path
+    # also write column arrays
+    npz_path = "simdata.npz"
+    np.savez_compressed(npz_path, **col_data)
+    print("Wrote", npz_path)
+    return npz_path
 
 if __name__ == "__main__":
     import argparse